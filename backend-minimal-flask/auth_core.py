@@ -5,32 +5,152 @@ Handles registration, login, TOTP, and email OTP flows
 import sqlite3
 import bcrypt
 import pyotp
-import qrcode
-import io
 import base64
-import jwt
+import hashlib
+import hmac
+import orjson
+import queue
 import secrets
+import threading
 import time
 import os
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional, Dict, Any
 
 # JWT secret from environment variable (with fallback for local development)
 JWT_SECRET = os.environ.get('JWT_SECRET', "demo_secret_key_change_in_production")
+JWT_SECRET_BYTES = JWT_SECRET.encode('utf-8')
 JWT_ALGORITHM = "HS256"
 
+def _b64url_encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+def _b64url_decode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64decode(raw + b"=" * (-len(raw) % 4))
+
+# Precomputed JWT header segment; every token we issue is HS256
+_JWT_HEADER = _b64url_encode(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}))
+
+# Maximum number of verified tokens kept in the in-process JWT cache
+JWT_CACHE_SIZE = 4096
+
+# How long a known-bad (email, password) pair is rejected without re-running
+# bcrypt; retrying the same wrong password is the common brute-force shape
+BAD_LOGIN_TTL = 30
+
+# Seconds between background sweeps of expired cache entries
+SWEEP_INTERVAL = 60
+
+# Number of pooled SQLite connections kept open for the process lifetime
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+
+# Bcrypt work factor: each login costs ~2^N Eksblowfish rounds, so demo and
+# load-test runs can dial this down (minimum 4) while production raises it
+BCRYPT_COST = int(os.environ.get('BCRYPT_COST', '10'))
+
+# Dedicated bounded pool for bcrypt: the C code releases the GIL, so the
+# request thread's SQLite/JSON work overlaps with the KDF, and the worker
+# cap keeps a login burst from monopolizing every CPU
+BCRYPT_POOL = ThreadPoolExecutor(
+    max_workers=(os.cpu_count() or 2) * 2,
+    thread_name_prefix='bcrypt'
+)
+
+# Hash verified against when the email is unknown, so a login attempt costs
+# the same ~one bcrypt run whether or not the user exists (no user
+# enumeration via response time)
+DUMMY_HASH = bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=BCRYPT_COST)).decode('utf-8')
+
+# Server-side key for HMAC-hashing short-lived email OTPs (with fallback for
+# local development); a 6-digit code that expires in 5 minutes does not need
+# a slow KDF like bcrypt
+OTP_PEPPER = os.environ.get('OTP_PEPPER', "demo_otp_pepper_change_in_production").encode('utf-8')
+
 class AuthCore:
     def __init__(self, db_path: str = None):
         # Use environment variable for DB path or default to auth_demo.db
         # Railway's persistent volume path if available, otherwise use local path
         self.db_path = db_path or os.environ.get('DATABASE_PATH', "auth_demo.db")
         self.init_db()
-    
+
+        # Pre-open a pool of long-lived connections so each request reuses
+        # SQLite's page cache instead of paying connect/close per call
+        self._pool: queue.Queue = queue.Queue()
+        for _ in range(POOL_SIZE):
+            self._pool.put(self._new_connection())
+
+        # Cache of already-verified tokens (token -> (exp, payload)) so
+        # repeated requests with the same token skip the HMAC + JSON parse
+        self._jwt_cache: OrderedDict = OrderedDict()
+        self._jwt_cache_lock = threading.Lock()
+
+        # TOTP verifiers memoized per user; the secret is immutable until
+        # enable_totp rotates it, which invalidates the entry
+        self._totp_cache: Dict[int, pyotp.TOTP] = {}
+        self._totp_cache_lock = threading.Lock()
+
+        # Known-bad login attempts ((email, sha256(password)) -> expiry) so a
+        # repeated wrong password is rejected without burning another bcrypt
+        # run; only confirmed failures are ever cached
+        self._bad_login: Dict[tuple, float] = {}
+        self._bad_login_lock = threading.Lock()
+
+        # OTP-bearing temp tokens already spent (token -> exp), so a
+        # captured OTP+token pair cannot be replayed within its window
+        self._used_otp_tokens: Dict[str, float] = {}
+        self._used_otp_lock = threading.Lock()
+
+        # Periodic sweeper reaps expired cache entries in one batch instead
+        # of hot paths paying for eviction inline
+        threading.Thread(target=self._sweep, daemon=True).start()
+
+    def _sweep(self):
+        """Background loop pruning expired JWT and bad-login cache entries"""
+        while True:
+            time.sleep(SWEEP_INTERVAL)
+            now = time.time()
+            with self._jwt_cache_lock:
+                for token in [t for t, (exp, _) in self._jwt_cache.items() if exp <= now]:
+                    del self._jwt_cache[token]
+            with self._bad_login_lock:
+                for key in [k for k, exp in self._bad_login.items() if exp <= now]:
+                    del self._bad_login[key]
+            with self._used_otp_lock:
+                for token in [t for t, exp in self._used_otp_tokens.items() if exp <= now]:
+                    del self._used_otp_tokens[token]
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Create a tuned long-lived connection for the pool"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+
+    @contextmanager
+    def _conn(self):
+        """Borrow a connection from the pool, returning it on exit"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
     def init_db(self):
         """Initialize SQLite database with required tables"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
-        
+
+        # WAL lets readers proceed concurrently with the single writer, and
+        # synchronous=NORMAL drops the per-insert fsync (safe under WAL)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+
         # Users table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -42,105 +162,152 @@ class AuthCore:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        # OTPs table for email OTP storage
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS otps (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                otp_hash TEXT NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                type TEXT DEFAULT 'email',
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
+
+        # Email lookups already seek on sqlite_autoindex_users_1 (from the
+        # UNIQUE constraint); drop the redundant index older versions built
+        cursor.execute("DROP INDEX IF EXISTS idx_users_email")
+
+        # Email OTP state now travels inside the signed temp token; drop the
+        # otps table from databases created by older versions
+        cursor.execute("DROP TABLE IF EXISTS otps")
+
         conn.commit()
         conn.close()
         print("Database initialized successfully")
-    
+
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    
+        """Hash password using bcrypt (runs on the bcrypt pool)"""
+        future = BCRYPT_POOL.submit(
+            bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COST)
+        )
+        return future.result().decode('utf-8')
+
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-    
-    def generate_jwt(self, user_id: int, email: str, expires_minutes: int = 15) -> str:
-        """Generate JWT token"""
+        """Verify password against hash (runs on the bcrypt pool)"""
+        future = BCRYPT_POOL.submit(
+            bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+        )
+        return future.result()
+
+    def hash_otp(self, otp_code: str) -> str:
+        """Hash a short-lived OTP with keyed HMAC-SHA256 (bcrypt is overkill here)"""
+        return hmac.new(OTP_PEPPER, otp_code.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def verify_otp_hash(self, otp_code: str, otp_hash: str) -> bool:
+        """Verify an OTP against its HMAC in constant time"""
+        return hmac.compare_digest(self.hash_otp(otp_code), otp_hash)
+
+    def generate_jwt(self, user_id: int, email: str, expires_minutes: int = 15,
+                     extra_claims: Optional[Dict[str, Any]] = None) -> str:
+        """Generate JWT token (hand-rolled HS256: orjson + hmac are all C calls)"""
         payload = {
             'user_id': user_id,
             'email': email,
-            'exp': datetime.utcnow() + timedelta(minutes=expires_minutes)
+            'exp': int(time.time()) + expires_minutes * 60
         }
-        return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
-    
+        if extra_claims:
+            payload.update(extra_claims)
+        signing_input = _JWT_HEADER + b"." + _b64url_encode(orjson.dumps(payload))
+        signature = _b64url_encode(hmac.new(JWT_SECRET_BYTES, signing_input, hashlib.sha256).digest())
+        return (signing_input + b"." + signature).decode('ascii')
+
     def verify_jwt(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify and decode JWT token"""
+        """Verify and decode JWT token, serving repeat tokens from cache"""
+        now = time.time()
+        with self._jwt_cache_lock:
+            entry = self._jwt_cache.get(token)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        payload = self._decode_jwt(token)
+        if payload is not None:
+            with self._jwt_cache_lock:
+                self._jwt_cache[token] = (payload['exp'], payload)
+                while len(self._jwt_cache) > JWT_CACHE_SIZE:
+                    self._jwt_cache.popitem(last=False)
+        return payload
+
+    def _decode_jwt(self, token: str) -> Optional[Dict[str, Any]]:
+        """Check the token signature and exp claim from scratch"""
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            header, body, signature = token.encode('ascii').split(b".")
+            expected = _b64url_encode(
+                hmac.new(JWT_SECRET_BYTES, header + b"." + body, hashlib.sha256).digest()
+            )
+            if not hmac.compare_digest(signature, expected):
+                return None
+            payload = orjson.loads(_b64url_decode(body))
+            if payload.get('exp', 0) < time.time():
+                return None
             return payload
-        except jwt.ExpiredSignatureError:
-            return None
-        except jwt.InvalidTokenError:
+        except Exception:
             return None
-    
+
     def register_user(self, email: str, password: str) -> Dict[str, Any]:
         """Register a new user"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if user already exists
-            cursor.execute("SELECT id FROM users WHERE email = ?", (email,))
-            if cursor.fetchone():
-                conn.close()
-                return {"error": "User already exists"}
-            
-            # Hash password and insert user
             password_hash = self.hash_password(password)
-            cursor.execute(
-                "INSERT INTO users (email, password_hash) VALUES (?, ?)",
-                (email, password_hash)
-            )
-            user_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
+
+            # Uniqueness check, insert, and id fetch in one statement
+            # (RETURNING needs SQLite >= 3.35)
+            with self._conn() as conn:
+                row = conn.execute(
+                    "INSERT INTO users (email, password_hash) VALUES (?, ?) "
+                    "ON CONFLICT(email) DO NOTHING RETURNING id",
+                    (email, password_hash)
+                ).fetchone()
+
+            if row is None:
+                return {"error": "User already exists"}
+
+            # Forget cached failures for this email: a login attempted
+            # before registration must not shadow the fresh credentials
+            with self._bad_login_lock:
+                for key in [k for k in self._bad_login if k[0] == email]:
+                    del self._bad_login[key]
+
             print(f"User registered: {email}")
-            return {"success": True, "user_id": user_id}
-            
+            return {"success": True, "user_id": row[0]}
+
         except Exception as e:
             print(f"Registration error: {e}")
             return {"error": "Registration failed"}
-    
+
     def login_user(self, email: str, password: str) -> Dict[str, Any]:
         """Login user and return token or MFA requirement"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get user data
-            cursor.execute(
-                "SELECT id, password_hash, mfa_enabled FROM users WHERE email = ?",
-                (email,)
-            )
-            user = cursor.fetchone()
-            
+            # Fast-reject a recently confirmed-bad attempt in microseconds
+            bad_key = (email, hashlib.sha256(password.encode('utf-8')).digest())
+            now = time.time()
+            with self._bad_login_lock:
+                if self._bad_login.get(bad_key, 0) > now:
+                    return {"error": "Invalid credentials"}
+            # Fixed SQL string so sqlite3's statement cache reuses the
+            # prepared statement; conn.execute skips the cursor allocation
+            with self._conn() as conn:
+                user = conn.execute(
+                    "SELECT id, password_hash, mfa_enabled FROM users WHERE email = ?",
+                    (email,)
+                ).fetchone()
+
             if not user:
-                conn.close()
+                # Burn the same bcrypt cost as the found-user path, then
+                # cache the failure like any other so repeats fast-reject
+                # identically whether or not the account exists
+                self.verify_password(password, DUMMY_HASH)
+                with self._bad_login_lock:
+                    self._bad_login[bad_key] = time.time() + BAD_LOGIN_TTL
                 return {"error": "Invalid credentials"}
-            
+
             user_id, password_hash, mfa_enabled = user
-            
+
             # Verify password
             if not self.verify_password(password, password_hash):
-                conn.close()
+                # Remember this confirmed-bad pair; the sweeper reaps it
+                with self._bad_login_lock:
+                    self._bad_login[bad_key] = time.time() + BAD_LOGIN_TTL
                 return {"error": "Invalid credentials"}
-            
-            conn.close()
-            
+
             # If MFA is enabled, return temp token for MFA verification
             if mfa_enabled:
                 temp_token = self.generate_jwt(user_id, email, expires_minutes=5)
@@ -154,53 +321,52 @@ class AuthCore:
                 token = self.generate_jwt(user_id, email)
                 print(f"Login successful for {email}")
                 return {"token": token}
-                
+
         except Exception as e:
             print(f"Login error: {e}")
             return {"error": "Login failed"}
-    
+
     def enable_totp(self, user_id: int) -> Dict[str, Any]:
         """Enable TOTP for user and return QR code"""
+        # Imported lazily: QR generation is rare and workers that never
+        # serve it should not pay the import at startup
+        import segno
+        import io
         try:
             # Generate TOTP secret
             totp_secret = pyotp.random_base32()
             totp = pyotp.TOTP(totp_secret)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(totp.provisioning_uri(
+
+            # Generate QR code (segno writes the PNG directly, no PIL image)
+            provisioning_uri = totp.provisioning_uri(
                 name="MFA Demo",
                 issuer_name="MFA Demo App"
-            ))
-            qr.make(fit=True)
-            
-            # Create QR code image
-            img = qr.make_image(fill_color="black", back_color="white")
+            )
             img_buffer = io.BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
+            segno.make(provisioning_uri, error='m').save(img_buffer, kind='png', scale=6)
             qr_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            
+
             # Store secret in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE users SET totp_secret = ?, mfa_enabled = TRUE WHERE id = ?",
-                (totp_secret, user_id)
-            )
-            conn.commit()
-            conn.close()
-            
+            with self._conn() as conn:
+                conn.execute(
+                    "UPDATE users SET totp_secret = ?, mfa_enabled = TRUE WHERE id = ?",
+                    (totp_secret, user_id)
+                )
+
+            # Drop any verifier built from the previous secret
+            with self._totp_cache_lock:
+                self._totp_cache.pop(user_id, None)
+
             print(f"TOTP enabled for user {user_id}")
             return {
                 "qr_png_base64": qr_base64,
                 "secret": totp_secret
             }
-            
+
         except Exception as e:
             print(f"TOTP enable error: {e}")
             return {"error": "Failed to enable TOTP"}
-    
+
     def verify_totp(self, temp_token: str, totp_code: str) -> Dict[str, Any]:
         """Verify TOTP code and return final token"""
         try:
@@ -208,26 +374,29 @@ class AuthCore:
             payload = self.verify_jwt(temp_token)
             if not payload:
                 return {"error": "Invalid or expired temp token"}
-            
+
             user_id = payload['user_id']
             email = payload['email']
-            
-            # Get user's TOTP secret
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT totp_secret FROM users WHERE id = ?",
-                (user_id,)
-            )
-            user = cursor.fetchone()
-            conn.close()
-            
-            if not user or not user[0]:
-                return {"error": "TOTP not enabled for user"}
-            
-            totp_secret = user[0]
-            totp = pyotp.TOTP(totp_secret)
-            
+
+            # Reuse the memoized verifier; on a miss, load the secret once
+            # and cache the TOTP object (base32 decode happens only here)
+            with self._totp_cache_lock:
+                totp = self._totp_cache.get(user_id)
+
+            if totp is None:
+                with self._conn() as conn:
+                    user = conn.execute(
+                        "SELECT totp_secret FROM users WHERE id = ?",
+                        (user_id,)
+                    ).fetchone()
+
+                if not user or not user[0]:
+                    return {"error": "TOTP not enabled for user"}
+
+                totp = pyotp.TOTP(user[0])
+                with self._totp_cache_lock:
+                    self._totp_cache[user_id] = totp
+
             # Verify TOTP code (allow 1-step window for clock drift)
             if totp.verify(totp_code, valid_window=1):
                 # Generate final token
@@ -236,49 +405,46 @@ class AuthCore:
                 return {"token": token}
             else:
                 return {"error": "Invalid TOTP code"}
-                
+
         except Exception as e:
             print(f"TOTP verification error: {e}")
             return {"error": "TOTP verification failed"}
-    
-    def send_email_otp(self, email: str) -> Dict[str, Any]:
+
+    def send_email_otp(self, email: str, temp_token: str) -> Dict[str, Any]:
         """Send email OTP (demo: print to console)"""
         try:
-            # Get user
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE email = ?", (email,))
-            user = cursor.fetchone()
-            
-            if not user:
-                conn.close()
-                return {"error": "User not found"}
-            
-            user_id = user[0]
-            
-            # Generate OTP
+            # The OTP is the second factor, so minting one requires the temp
+            # token issued by a successful password login for this account
+            payload = self.verify_jwt(temp_token)
+            if not payload or payload['email'] != email:
+                return {"error": "Invalid or expired temp token"}
+
+            user_id = payload['user_id']
+
+            # Generate OTP; its HMAC travels inside a fresh temp token as a
+            # signed claim bound to the password-authenticated session, so
+            # no server-side OTP row is needed at all and the JWT exp
+            # doubles as the 5-minute expiry
             otp_code = str(secrets.randbelow(900000) + 100000)  # 6-digit code
-            otp_hash = self.hash_password(otp_code)
-            
-            # Store OTP with 5-minute expiry
-            expires_at = datetime.utcnow() + timedelta(minutes=5)
-            cursor.execute(
-                "INSERT INTO otps (user_id, otp_hash, expires_at) VALUES (?, ?, ?)",
-                (user_id, otp_hash, expires_at)
+            otp_token = self.generate_jwt(
+                user_id, email, expires_minutes=5,
+                extra_claims={'otp_hash': self.hash_otp(otp_code)}
             )
-            conn.commit()
-            conn.close()
-            
+
             # Print OTP to console for demo
             print(f"EMAIL OTP for {email}: {otp_code}")
             print("(In production, this would be sent via SMTP)")
-            
-            return {"success": True, "message": "OTP sent to console for demo"}
-            
+
+            return {
+                "success": True,
+                "message": "OTP sent to console for demo",
+                "temp_token": otp_token
+            }
+
         except Exception as e:
             print(f"Email OTP send error: {e}")
             return {"error": "Failed to send OTP"}
-    
+
     def verify_email_otp(self, email: str, otp: str, temp_token: str) -> Dict[str, Any]:
         """Verify email OTP and return final token"""
         try:
@@ -286,58 +452,53 @@ class AuthCore:
             payload = self.verify_jwt(temp_token)
             if not payload:
                 return {"error": "Invalid or expired temp token"}
-            
+
             user_id = payload['user_id']
-            
-            # Get and verify OTP
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT otp_hash FROM otps WHERE user_id = ? AND expires_at > ? ORDER BY id DESC LIMIT 1",
-                (user_id, datetime.utcnow())
-            )
-            otp_record = cursor.fetchone()
-            
-            if not otp_record:
-                conn.close()
+
+            # The OTP's HMAC rides in the signed temp token, so verification
+            # is pure compute: no SELECT, no DELETE
+            otp_hash = payload.get('otp_hash')
+            if not otp_hash:
                 return {"error": "No valid OTP found"}
-            
-            otp_hash = otp_record[0]
-            
-            # Verify OTP
-            if not self.verify_password(otp, otp_hash):
-                conn.close()
+
+            # Each OTP token is single-use, like the deleted row used to be.
+            # Spend it atomically before the HMAC compare so two concurrent
+            # requests with the same pair cannot both pass the check; the
+            # sweeper reaps the entry once the claim expires
+            with self._used_otp_lock:
+                if temp_token in self._used_otp_tokens:
+                    return {"error": "OTP already used"}
+                self._used_otp_tokens[temp_token] = payload['exp']
+
+            # Verify OTP (a wrong code does not spend the token)
+            if not self.verify_otp_hash(otp, otp_hash):
+                with self._used_otp_lock:
+                    self._used_otp_tokens.pop(temp_token, None)
                 return {"error": "Invalid OTP"}
-            
-            # Clean up used OTP
-            cursor.execute("DELETE FROM otps WHERE user_id = ?", (user_id,))
-            conn.commit()
-            conn.close()
-            
+
             # Generate final token
             token = self.generate_jwt(user_id, email)
             print(f"Email OTP verification successful for {email}")
             return {"token": token}
-            
+
         except Exception as e:
             print(f"Email OTP verification error: {e}")
             return {"error": "OTP verification failed"}
-    
+
     def get_user_profile(self, user_id: int) -> Dict[str, Any]:
         """Get user profile information"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT email, mfa_enabled, created_at FROM users WHERE id = ?",
-                (user_id,)
-            )
-            user = cursor.fetchone()
-            conn.close()
-            
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT email, mfa_enabled, created_at FROM users WHERE id = ?",
+                    (user_id,)
+                )
+                user = cursor.fetchone()
+
             if not user:
                 return {"error": "User not found"}
-            
+
             email, mfa_enabled, created_at = user
             return {
                 "user_id": user_id,
@@ -345,7 +506,7 @@ class AuthCore:
                 "mfa_enabled": bool(mfa_enabled),
                 "created_at": created_at
             }
-            
+
         except Exception as e:
             print(f"Profile fetch error: {e}")
             return {"error": "Failed to fetch profile"}
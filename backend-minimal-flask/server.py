@@ -1,201 +1,223 @@
 """
-Flask server for MFA demo
+Quart server for MFA demo
 Provides REST API endpoints for authentication and MFA flows
 """
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
+import asyncio
+import orjson
+from quart import Quart, g, request, jsonify, send_from_directory
+from quart.json.provider import JSONProvider
+from quart_cors import cors
 import os
 from pathlib import Path
 from auth_core import AuthCore
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson's C encoder/decoder"""
+
+    def dumps(self, object_, **kwargs):
+        return orjson.dumps(object_).decode('utf-8')
+
+    def loads(self, object_, **kwargs):
+        return orjson.loads(object_)
+
 # Get the base directory (backend-minimal-flask)
 BASE_DIR = Path(__file__).parent
 # Get frontend directory (parent directory + frontend)
 FRONTEND_DIR = BASE_DIR.parent / 'frontend'
 
-app = Flask(__name__, static_folder=str(FRONTEND_DIR))
-CORS(app)
+app = Quart(__name__, static_folder=str(FRONTEND_DIR))
+app = cors(app)
+app.json = OrjsonProvider(app)
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 300
 
 # Initialize auth core
 auth = AuthCore()
 
+@app.before_request
+async def parse_body():
+    """Parse the JSON body once per request; handlers read g.body"""
+    if request.is_json:
+        body = await request.get_json(silent=True)
+        # Non-object bodies like [1,2,3] or "hello" are valid JSON but not
+        # field maps; treat them as empty so handlers return a clean 400
+        g.body = body if isinstance(body, dict) else {}
+    else:
+        g.body = {}
+
 @app.route('/')
-def serve_frontend():
+async def serve_frontend():
     """Serve the main frontend page"""
-    return send_from_directory(str(FRONTEND_DIR), 'index.html')
+    # Short max-age so a redeployed index.html picks up new asset references
+    return await send_from_directory(str(FRONTEND_DIR), 'index.html', cache_timeout=60)
 
 @app.route('/<path:filename>')
-def serve_static(filename):
+async def serve_static(filename):
     """Serve static files from frontend directory"""
-    return send_from_directory(str(FRONTEND_DIR), filename)
+    # The asset URLs carry no content hash, so a modest max-age is the most
+    # we can cache; conditional requests still get 304s from the ETag, which
+    # keeps repeat loads close to free without pinning stale JS for a year
+    return await send_from_directory(str(FRONTEND_DIR), filename, cache_timeout=300)
 
 @app.route('/api/register', methods=['POST'])
-def register():
+async def register():
     """Register a new user"""
     try:
-        data = request.get_json()
-        if not data or 'email' not in data or 'password' not in data:
+        email = g.body.get('email')
+        password = g.body.get('password')
+        if not email or not password:
             return jsonify({"error": "Email and password required"}), 400
-        
-        email = data['email']
-        password = data['password']
-        
+
         # Basic validation
         if len(password) < 6:
             return jsonify({"error": "Password must be at least 6 characters"}), 400
-        
-        result = auth.register_user(email, password)
+
+        # Blocking bcrypt/SQLite work runs off the event loop
+        result = await asyncio.to_thread(auth.register_user, email, password)
         if 'error' in result:
             return jsonify(result), 400
-        
+
         return jsonify(result), 201
-        
+
     except Exception as e:
         print(f"Registration endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/login', methods=['POST'])
-def login():
+async def login():
     """Login user"""
     try:
-        data = request.get_json()
-        if not data or 'email' not in data or 'password' not in data:
+        email = g.body.get('email')
+        password = g.body.get('password')
+        if not email or not password:
             return jsonify({"error": "Email and password required"}), 400
-        
-        email = data['email']
-        password = data['password']
-        
-        result = auth.login_user(email, password)
+
+        result = await asyncio.to_thread(auth.login_user, email, password)
         if 'error' in result:
             return jsonify(result), 401
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"Login endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/mfa/enable', methods=['POST'])
-def enable_mfa():
+async def enable_mfa():
     """Enable TOTP MFA for user"""
     try:
         # Get token from Authorization header
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({"error": "Authorization token required"}), 401
-        
+
         token = auth_header.split(' ')[1]
         payload = auth.verify_jwt(token)
         if not payload:
             return jsonify({"error": "Invalid or expired token"}), 401
-        
+
         user_id = payload['user_id']
-        result = auth.enable_totp(user_id)
-        
+        result = await asyncio.to_thread(auth.enable_totp, user_id)
+
         if 'error' in result:
             return jsonify(result), 400
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"MFA enable endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/mfa/totp/verify', methods=['POST'])
-def verify_totp():
+async def verify_totp():
     """Verify TOTP code"""
     try:
-        data = request.get_json()
-        if not data or 'temp_token' not in data or 'totp_code' not in data:
+        temp_token = g.body.get('temp_token')
+        totp_code = g.body.get('totp_code')
+        if not temp_token or not totp_code:
             return jsonify({"error": "temp_token and totp_code required"}), 400
-        
-        temp_token = data['temp_token']
-        totp_code = data['totp_code']
-        
-        result = auth.verify_totp(temp_token, totp_code)
+
+        result = await asyncio.to_thread(auth.verify_totp, temp_token, totp_code)
         if 'error' in result:
             return jsonify(result), 401
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"TOTP verify endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/mfa/email/send_otp', methods=['POST'])
-def send_email_otp():
+async def send_email_otp():
     """Send email OTP"""
     try:
-        data = request.get_json()
-        if not data or 'email' not in data:
-            return jsonify({"error": "Email required"}), 400
-        
-        email = data['email']
-        result = auth.send_email_otp(email)
-        
+        email = g.body.get('email')
+        temp_token = g.body.get('temp_token')
+        if not email or not temp_token:
+            return jsonify({"error": "email and temp_token required"}), 400
+
+        result = await asyncio.to_thread(auth.send_email_otp, email, temp_token)
+
         if 'error' in result:
             return jsonify(result), 400
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"Email OTP send endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/mfa/email/verify', methods=['POST'])
-def verify_email_otp():
+async def verify_email_otp():
     """Verify email OTP"""
     try:
-        data = request.get_json()
-        if not data or 'email' not in data or 'otp' not in data or 'temp_token' not in data:
+        email = g.body.get('email')
+        otp = g.body.get('otp')
+        temp_token = g.body.get('temp_token')
+        if not email or not otp or not temp_token:
             return jsonify({"error": "email, otp, and temp_token required"}), 400
-        
-        email = data['email']
-        otp = data['otp']
-        temp_token = data['temp_token']
-        
-        result = auth.verify_email_otp(email, otp, temp_token)
+
+        result = await asyncio.to_thread(auth.verify_email_otp, email, otp, temp_token)
         if 'error' in result:
             return jsonify(result), 401
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"Email OTP verify endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/profile', methods=['GET'])
-def get_profile():
+async def get_profile():
     """Get user profile (protected endpoint)"""
     try:
         # Get token from Authorization header
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({"error": "Authorization token required"}), 401
-        
+
         token = auth_header.split(' ')[1]
         payload = auth.verify_jwt(token)
         if not payload:
             return jsonify({"error": "Invalid or expired token"}), 401
-        
+
         user_id = payload['user_id']
-        result = auth.get_user_profile(user_id)
-        
+        result = await asyncio.to_thread(auth.get_user_profile, user_id)
+
         if 'error' in result:
             return jsonify(result), 404
-        
+
         return jsonify(result), 200
-        
+
     except Exception as e:
         print(f"Profile endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     return jsonify({"error": "Endpoint not found"}), 404
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 
 if __name__ == '__main__':
@@ -203,7 +225,7 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     # Disable debug mode in production
     debug = os.environ.get('FLASK_ENV') == 'development'
-    
+
     print(f"Starting MFA Demo Server...")
     print(f"Server will be available at: http://0.0.0.0:{port}")
     print(f"Frontend will be served at: http://0.0.0.0:{port}")
@@ -141,7 +141,14 @@ async function sendEmailOTP() {
     const email = document.getElementById('email').value;
     
     try {
-        await apiCall('/api/mfa/email/send_otp', 'POST', { email });
+        const result = await apiCall('/api/mfa/email/send_otp', 'POST', {
+            email,
+            temp_token: tempToken
+        });
+        // The OTP challenge is bound to this fresh temp token
+        if (result.temp_token) {
+            tempToken = result.temp_token;
+        }
         document.getElementById('emailOTPSection').classList.remove('hidden');
         showAlert('OTP sent! Check server console for the code (demo mode).', 'info');
     } catch (error) {